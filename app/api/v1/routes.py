@@ -2,6 +2,7 @@
 API routes for the AI extraction service.
 """
 
+import asyncio
 import time
 import logging
 from fastapi import APIRouter, HTTPException, Depends, Request
@@ -19,9 +20,20 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Wall-clock process start, captured once for the health uptime report
+_PROCESS_START = time.time()
 
-def get_extraction_service(request: Request) -> ExtractionService:
-    """Dependency to get the extraction service instance."""
+# Cap concurrent Gemini calls per batch to stay under API rate limits
+BATCH_CONCURRENCY = 5
+
+
+async def get_extraction_service(request: Request) -> ExtractionService:
+    """Dependency to get the shared extraction service initialized in lifespan.
+
+    Declared async so FastAPI awaits it inline instead of dispatching to the
+    threadpool; returning the app.state singleton avoids rebuilding the
+    Gemini client on every request.
+    """
     return request.app.state.extraction_service
 
 
@@ -36,7 +48,7 @@ async def extract_job_info(
     Takes raw HTML and text from a LinkedIn post and returns structured
     job information including title, company, skills, etc.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     try:
         logger.info(f"Processing extraction request for {len(request.raw_html)} chars of HTML")
@@ -47,7 +59,7 @@ async def extract_job_info(
             request.raw_text
         )
 
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
 
         return ExtractionResponse(
             success=True,
@@ -56,7 +68,7 @@ async def extract_job_info(
         )
 
     except Exception as e:
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         logger.error(f"Extraction failed: {e}")
 
         return ExtractionResponse(
@@ -75,7 +87,7 @@ async def health_check(
         status="healthy",
         version="1.0.0",
         models_loaded=["spaCy", "OpenAI"],
-        uptime=time.time()  # Simplified uptime
+        uptime=time.time() - _PROCESS_START
     )
 
 
@@ -95,39 +107,51 @@ async def extract_batch(
             detail="Maximum 10 posts per batch request"
         )
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     results = []
 
     try:
-        for i, request in enumerate(requests):
-            try:
-                logger.info(f"Processing batch item {i+1}/{len(requests)}")
+        # Fan out the independent Gemini calls concurrently; the semaphore
+        # caps how many are in flight at once to avoid rate limits.
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
 
-                extracted_info = await service.extract_job_info(
+        async def extract_one(request: ExtractionRequest):
+            async with semaphore:
+                return await service.extract_job_info(
                     request.raw_html,
                     request.raw_text
                 )
 
+        outcomes = await asyncio.gather(
+            *(extract_one(request) for request in requests),
+            return_exceptions=True
+        )
+
+        successful = 0
+        failed = 0
+        for i, outcome in enumerate(outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Batch item {i+1} failed: {outcome}")
+                failed += 1
                 results.append({
                     "index": i,
-                    "success": True,
-                    "data": extracted_info.dict(),
+                    "success": False,
+                    "error": str(outcome),
                 })
-
-            except Exception as e:
-                logger.error(f"Batch item {i+1} failed: {e}")
+            else:
+                successful += 1
                 results.append({
                     "index": i,
-                    "success": False,
-                    "error": str(e),
+                    "success": True,
+                    "data": outcome.model_dump(mode="json"),
                 })
 
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
 
         return {
             "total_processed": len(results),
-            "successful": len([r for r in results if r["success"]]),
-            "failed": len([r for r in results if not r["success"]]),
+            "successful": successful,
+            "failed": failed,
             "results": results,
             "total_processing_time": round(processing_time, 2),
         }
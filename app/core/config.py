@@ -15,32 +15,42 @@ class Settings(BaseSettings):
     API_PORT: int = 8000
     DEBUG: bool = False
 
-    # CORS Settings
+    # CORS Settings. Explicit origins only: mixing "*" with
+    # allow_credentials forces the middleware onto its slowest per-request
+    # path (and credentialed wildcard is rejected by browsers anyway).
     ALLOWED_ORIGINS: List[str] = [
         "http://localhost:3000",
         "http://localhost:8000",
         "https://hireoo.com",
         "https://hireoo-taupe.vercel.app",
-        "https://hireoo.in",    
-        "*"
+        "https://hireoo.in",
     ]
 
     # Gemini Settings
     GEMINI_API_KEY: str = ""
     GEMINI_MODEL: str = "gemini-pro"
+    GEMINI_MAX_CONCURRENCY: int = 20
 
     # OpenAI Settings
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = "gpt-3.5-turbo"
     OPENAI_MAX_TOKENS: int = 1000
     OPENAI_TEMPERATURE: float = 0.1
+    OPENAI_CONCURRENCY: int = 10
 
     # spaCy Settings
     SPACY_MODEL: str = "en_core_web_sm"
 
     # Processing Settings
+    # Use the selectolax HTML engine when installed; BeautifulSoup remains
+    # the fallback (and the forced engine when this is off)
+    USE_SELECTOLAX: bool = True
     MAX_TEXT_LENGTH: int = 10000
     REQUEST_TIMEOUT: int = 30
+    # Hard cap on request body size, checked before the body is parsed.
+    # Slightly above the 50KB per-field model limit to leave room for
+    # JSON framing and escaping.
+    MAX_REQUEST_BYTES: int = 60 * 1024
 
     # Logging
     LOG_LEVEL: str = "INFO"
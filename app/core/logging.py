@@ -3,11 +3,16 @@ Logging configuration for the AI extraction service.
 """
 
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 
 from app.core.config import settings
 
+# Keep a reference so the listener thread isn't garbage collected
+_queue_listener = None
+
 
 def setup_logging():
     """Configure logging for the application."""
@@ -39,17 +44,27 @@ def setup_logging():
     console_handler.setFormatter(simple_formatter)
     root_logger.addHandler(console_handler)
 
-    # File handler for all logs
+    # File handlers perform blocking writes, so they sit behind a queue:
+    # request-path loggers only enqueue records and a listener thread does
+    # the actual file I/O.
     file_handler = logging.FileHandler("logs/ai_extraction.log")
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(file_handler)
 
-    # File handler for errors only
     error_file_handler = logging.FileHandler("logs/errors.log")
     error_file_handler.setLevel(logging.ERROR)
     error_file_handler.setFormatter(detailed_formatter)
-    root_logger.addHandler(error_file_handler)
+
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, error_file_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
 
     # Set specific loggers
     logging.getLogger("uvicorn").setLevel(logging.INFO)
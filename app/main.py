@@ -3,10 +3,9 @@ Hireoo AI Extraction Service
 FastAPI microservice for extracting job information from LinkedIn posts using AI.
 """
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 import logging
 from contextlib import asynccontextmanager
 
@@ -25,13 +24,17 @@ async def lifespan(app: FastAPI):
     logger = logging.getLogger(__name__)
     logger.info("Starting Hireoo AI Extraction Service")
 
-    # Initialize services
+    # Initialize services once; routes resolve this instance via
+    # get_extraction_service so no per-request construction happens.
     extraction_service = ExtractionService()
     await extraction_service.initialize()
 
     # Store service instance
     app.state.extraction_service = extraction_service
 
+    if extraction_service.gemini_service.model is None:
+        logger.warning("Gemini model is not initialized; extraction requests will fail")
+
     logger.info("AI Extraction Service started successfully")
 
     yield
@@ -46,6 +49,7 @@ app = FastAPI(
     description="AI-powered job information extraction from LinkedIn posts",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -57,6 +61,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reject oversized payloads from the Content-Length header, before orjson
+# or Pydantic ever touch the body.
+@app.middleware("http")
+async def limit_request_size(request, call_next):
+    content_length = request.headers.get("content-length")
+    if content_length is not None:
+        try:
+            if int(content_length) > settings.MAX_REQUEST_BYTES:
+                return PlainTextResponse("payload too large", status_code=413)
+        except ValueError:
+            return PlainTextResponse("invalid content-length", status_code=400)
+    return await call_next(request)
+
 # Include routers
 app.include_router(router, prefix="/api/v1")
 
@@ -77,11 +94,15 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
+    # Single worker: each worker's lifespan builds its own cleaner process
+    # pool and caches, so scaling out belongs to the process manager
+    # (e.g. the container orchestrator), not an in-process multiplier.
     uvicorn.run(
         "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        host=settings.API_HOST,
+        port=settings.API_PORT,
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
 
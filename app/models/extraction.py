@@ -39,6 +39,29 @@ class ExtractionRequest(BaseModel):
         }
 
 
+class JobExtraction(BaseModel):
+    """Schema the LLM must return for structured-output extraction.
+
+    Mirrors the prompt's field list (confidence is computed service-side).
+    Every field is required and extra keys are forbidden, as OpenAI's
+    strict JSON-schema mode demands; absent values come back as null.
+    """
+
+    job_title: Optional[str] = Field(description="Extracted job title")
+    company: Optional[str] = Field(description="Company name")
+    location: Optional[str] = Field(description="Job location")
+    skills: List[str] = Field(description="Required skills")
+    experience_required: Optional[str] = Field(description="Experience level required")
+    hr_name: Optional[str] = Field(description="HR contact name")
+    hr_email: Optional[str] = Field(description="HR contact email")
+    salary_range: Optional[str] = Field(description="Salary information if mentioned")
+    job_type: Optional[str] = Field(description="Full-time, part-time, contract, etc.")
+    application_deadline: Optional[str] = Field(description="Application deadline if mentioned")
+
+    class Config:
+        extra = "forbid"
+
+
 class ExtractedJobInfo(BaseModel):
     """Extracted job information."""
 
@@ -2,16 +2,74 @@
 Service for interacting with Google's Gemini API for job info extraction.
 """
 
-import json
+import asyncio
+import hashlib
 import logging
+import random
+import re
+import time
+from collections import OrderedDict
 from typing import Dict, Any, List
 import google.generativeai as genai
+import orjson
+from google.api_core import exceptions as google_exceptions
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of cached extraction results kept in memory
+CACHE_MAX_SIZE = 1024
+
+# Attempts per Gemini call before giving up on rate-limit/deadline errors
+MAX_RETRIES = 3
+
+# Matches a JSON object wrapped in a markdown code fence (```json ... ```)
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.S)
+
+# Prompt templates built once at import; _construct_prompt fills the
+# placeholders with format_map instead of re-assembling an f-string per call.
+_PROMPT_TEMPLATE_NOENT = """
+        You are an expert HR data analyst. Your task is to extract structured job information from the raw text of a LinkedIn job post.
+
+        I will provide the raw text and some potential entities identified by heuristic rules (spaCy).
+
+        Please extract the following fields in strict JSON format:
+        - job_title: The specific job title (e.g. "Senior React Developer"). If not explicitly stated, INFER it from the context. Do not use "Unknown".
+        - company: The hiring company name. If not explicitly stated, check for email domains or mentions.
+        - location: The job location (City, Country or "Remote")
+        - skills: A list of specific technical and soft skills required (strings)
+        - experience_required: Years of experience or level (e.g. "3-5 years", "Senior")
+        - salary_range: Salary information if available (e.g. "$120k - $150k" or "Competitive"), else null
+        - job_type: "Full-time", "Part-time", "Contract", "Internship"
+        - hr_name: Name of the hiring manager/recruiter if mentioned, else null
+        - hr_email: Email address of the recruiter/company if mentioned, else null
+        - application_deadline: Date if mentioned, else null
+        - description: A clean, formatted summary of the job description in Markdown.
+           - Use paragraphs (\\n\\n) to separate sections like "About the Role", "Requirements", "Benefits".
+           - Do not use headers (#), just bold text (**Role**) if needed.
+           - FIX broken lines: Join sentences that are split across lines.
+           - Keep it under 500 words.
+        - confidence_score: A float between 0.0 and 1.0 indicating your confidence in the extraction
+
+        Raw Text:
+        \"\"\"
+        {text}
+        \"\"\"
+
+        Return ONLY the valid JSON object. Do not include any explanation or markdown formatting outside the JSON.
+        """
+
+_PROMPT_TEMPLATE = _PROMPT_TEMPLATE_NOENT.replace(
+    "\n        Return ONLY the valid JSON object.",
+    """
+        Potential Entities (for context only, verify in text):
+        {entities}
+
+        Return ONLY the valid JSON object.""",
+)
+
 
 class GeminiService:
     """Service for interacting with Google's Gemini API."""
@@ -20,9 +78,24 @@ class GeminiService:
         self.api_key = settings.GEMINI_API_KEY
         self.model_name = settings.GEMINI_MODEL
         self.model = None
+        # LRU cache of extraction results keyed on a hash of the input text,
+        # so duplicate posts (reposts, retries) skip the Gemini round trip.
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = asyncio.Lock()
+        # In-flight futures keyed the same way as the cache; concurrent
+        # duplicate requests coalesce onto a single Gemini call.
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Global cap on concurrent Gemini calls to avoid rate limits and
+        # socket exhaustion under burst traffic
+        self._sem = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
 
     async def initialize(self):
         """Initialize the Gemini client."""
+        if self.model is not None:
+            # Already initialized; keep the existing model so its underlying
+            # HTTP channel and connections are reused across requests.
+            return
+
         if not self.api_key:
             logger.warning("GEMINI_API_KEY not set. Gemini service will not function correctly.")
             return
@@ -49,9 +122,52 @@ class GeminiService:
             logger.error("Gemini model not initialized")
             return {}
 
-        start_time = logging.time.time()
+        cache_key = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        async with self._cache_lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                logger.debug("Gemini cache hit")
+                return self._cache[cache_key]
+            # Single-flight: if an identical extraction is already in flight,
+            # await its result instead of issuing another Gemini call.
+            inflight = self._inflight.get(cache_key)
+            if inflight is None:
+                inflight = asyncio.get_running_loop().create_future()
+                self._inflight[cache_key] = inflight
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            logger.debug("Awaiting in-flight Gemini call for duplicate input")
+            return await inflight
 
         try:
+            data = await self._extract_uncached(text, spacy_entities, cache_key)
+            inflight.set_result(data)
+            return data
+        except Exception as e:
+            inflight.set_exception(e)
+            raise
+        finally:
+            # CancelledError is a BaseException and skips the except above;
+            # resolve the future regardless so duplicate waiters never hang
+            # on an entry that is about to be removed.
+            if not inflight.done():
+                inflight.cancel()
+            async with self._cache_lock:
+                del self._inflight[cache_key]
+
+    async def _extract_uncached(self, text: str, spacy_entities: Dict[str, Any], cache_key: str) -> Dict[str, Any]:
+        """Perform the actual Gemini call for a cache miss."""
+        start_time = time.perf_counter()
+
+        try:
+            # Truncate before building the prompt so the oversized string is
+            # never interpolated (Gemini has large context but good to be safe)
+            if len(text) > 15000:
+                text = text[:15000] + "...(truncated)"
+
             # Construct prompt
             prompt = self._construct_prompt(text, spacy_entities)
 
@@ -71,78 +187,78 @@ class GeminiService:
                 max_output_tokens=1024,
             )
             
-            # Using async generation if available or synchronous wrapped in run_in_executor
-            # The python SDK is synchronous primarily, but we can call it directly here
-            # considering it's an IO bound operation, in a real async app we might want to offload this.
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config,
-                safety_settings=safety_settings
+            result_text = await self._generate_with_retry(
+                prompt, generation_config, safety_settings
             )
             
-            result_text = response.text
-            
-            # Clean up markdown code blocks if present
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0].strip()
-            
+            # Strip a markdown code fence if present (single scan)
+            fence_match = _FENCE_RE.search(result_text)
+            payload = fence_match.group(1) if fence_match else result_text.strip()
+
             # Parse JSON
             try:
-                data = json.loads(result_text)
+                data = orjson.loads(payload)
+                await self._cache_put(cache_key, data)
+                elapsed = time.perf_counter() - start_time
+                logger.info(f"Gemini extraction completed in {elapsed:.2f} seconds")
                 return data
-            except json.JSONDecodeError:
-                logger.error(f"Failed to parse Gemini response as JSON: {result_text[:100]}...")
+            except orjson.JSONDecodeError:
+                logger.error(f"Failed to parse Gemini response as JSON: {payload[:100]}...")
                 return {"error": "Failed to parse JSON response"}
                 
         except Exception as e:
             logger.error(f"Gemini extraction failed: {e}")
             return {"error": str(e)}
 
-    def _construct_prompt(self, text: str, spacy_entities: Dict[str, Any]) -> str:
-        """Construct the prompt for Gemini."""
-        
-        # Format spacy entities for context
-        entities_str = json.dumps(spacy_entities, indent=2)
-        
-        # Truncate text if too long (Gemini has large context but good to be safe)
-        if len(text) > 15000:
-            text = text[:15000] + "...(truncated)"
-            
-        return f"""
-        You are an expert HR data analyst. Your task is to extract structured job information from the raw text of a LinkedIn job post.
-        
-        I will provide the raw text and some potential entities identified by heuristic rules (spaCy).
-        
-        Please extract the following fields in strict JSON format:
-        - job_title: The specific job title (e.g. "Senior React Developer"). If not explicitly stated, INFER it from the context. Do not use "Unknown".
-        - company: The hiring company name. If not explicitly stated, check for email domains or mentions.
-        - location: The job location (City, Country or "Remote")
-        - skills: A list of specific technical and soft skills required (strings)
-        - experience_required: Years of experience or level (e.g. "3-5 years", "Senior")
-        - salary_range: Salary information if available (e.g. "$120k - $150k" or "Competitive"), else null
-        - job_type: "Full-time", "Part-time", "Contract", "Internship"
-        - hr_name: Name of the hiring manager/recruiter if mentioned, else null
-        - hr_email: Email address of the recruiter/company if mentioned, else null
-        - application_deadline: Date if mentioned, else null
-        - description: A clean, formatted summary of the job description in Markdown. 
-           - Use paragraphs (\\n\\n) to separate sections like "About the Role", "Requirements", "Benefits". 
-           - Do not use headers (#), just bold text (**Role**) if needed.
-           - FIX broken lines: Join sentences that are split across lines. 
-           - Keep it under 500 words.
-        - confidence_score: A float between 0.0 and 1.0 indicating your confidence in the extraction
-        
-        Raw Text:
-        \"\"\"
-        {text}
-        \"\"\"
-        
-        Potential Entities (for context only, verify in text):
-        {entities_str}
-        
-        Return ONLY the valid JSON object. Do not include any explanation or markdown formatting outside the JSON.
+    async def _generate_with_retry(self, prompt, generation_config, safety_settings) -> str:
+        """Call Gemini under the global concurrency cap, retrying rate-limit
+        and deadline errors with exponential backoff plus jitter.
+
+        Use the SDK's async variant so the Gemini round trip doesn't block
+        the event loop; streaming lets the buffer fill as tokens arrive,
+        yielding to other coroutines between chunks instead of one long await.
         """
+        for attempt in range(MAX_RETRIES):
+            try:
+                async with self._sem:
+                    response = await self.model.generate_content_async(
+                        prompt,
+                        generation_config=generation_config,
+                        safety_settings=safety_settings,
+                        stream=True
+                    )
+
+                    buf = []
+                    async for chunk in response:
+                        if chunk.parts:
+                            buf.append(chunk.text)
+                    return "".join(buf)
+            except (google_exceptions.ResourceExhausted, google_exceptions.DeadlineExceeded) as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                delay = 2 ** attempt * 0.25 + random.random() * 0.1
+                logger.warning(
+                    f"Gemini call failed ({e.__class__.__name__}), retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def _cache_put(self, cache_key: str, data: Dict[str, Any]):
+        """Insert a successful extraction into the LRU cache, evicting the oldest entry if full."""
+        async with self._cache_lock:
+            self._cache[cache_key] = data
+            self._cache.move_to_end(cache_key)
+            if len(self._cache) > CACHE_MAX_SIZE:
+                self._cache.popitem(last=False)
+
+    def _construct_prompt(self, text: str, spacy_entities: Dict[str, Any]) -> str:
+        """Construct the prompt for Gemini. Callers truncate text beforehand."""
+
+        # Fill the precompiled template; skip the entities dump entirely when
+        # the caller passed no entities (the current extraction path does)
+        if spacy_entities:
+            entities_str = orjson.dumps(spacy_entities, option=orjson.OPT_INDENT_2).decode()
+            return _PROMPT_TEMPLATE.format_map({"text": text, "entities": entities_str})
+        return _PROMPT_TEMPLATE_NOENT.format_map({"text": text})
 
     async def cleanup(self):
         """Cleanup resources."""
@@ -2,21 +2,127 @@
 OpenAI service for intelligent job information extraction and cleanup.
 """
 
+import asyncio
+import httpx
 import openai
+import orjson
 from typing import Dict, Any, Optional
-import json
 import logging
 
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
 from app.core.config import settings
+from app.models.extraction import JobExtraction
+from app.utils.html_cleaner import HTMLCleaner
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 multiplexing needs the optional h2 package (httpx[http2]); fall
+# back to HTTP/1.1 when it isn't installed, same pattern as the optional
+# HTML parser backends.
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# One tuned connection pool for all OpenAI traffic in this process. The
+# SDK's default client would build its own pool per instance; sharing one
+# keeps TLS handshakes off the request path (connections stay warm for
+# 30s) and caps total sockets.
+_HTTP_CLIENT = httpx.AsyncClient(
+    http2=_HTTP2_AVAILABLE,
+    limits=httpx.Limits(
+        max_connections=100,
+        max_keepalive_connections=50,
+        keepalive_expiry=30,
+    ),
+    timeout=httpx.Timeout(60.0, connect=5.0),
+)
+
+# Structured-output contract: the server guarantees schema-conforming JSON,
+# so parse-failure retries (each a full extra LLM call) disappear.
+_JSON_SCHEMA_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "job_extraction",
+        "schema": JobExtraction.model_json_schema(),
+        "strict": True,
+    },
+}
+
+
+def _supports_json_schema(model: str) -> bool:
+    """Whether the model accepts strict json_schema response_format.
+
+    Structured outputs shipped with gpt-4o-mini and the gpt-4o-2024-08-06
+    snapshot; earlier chat models (gpt-3.5-turbo, gpt-4, gpt-4-turbo, the
+    May 2024 gpt-4o snapshot) reject the parameter with a 400.
+    """
+    if model == "gpt-4o-2024-05-13":
+        return False
+    return model.startswith(("gpt-4o", "gpt-4.1", "gpt-5", "o1", "o3", "o4"))
+
+
+# Older models still get server-guaranteed syntactically valid JSON via
+# json_object mode; only the schema enforcement is lost.
+_RESPONSE_FORMAT = (
+    _JSON_SCHEMA_FORMAT
+    if _supports_json_schema(settings.OPENAI_MODEL)
+    else {"type": "json_object"}
+)
+
+# Static instructions live entirely in the system message, byte-identical
+# across calls, so OpenAI's automatic prompt caching can match the prefix
+# (discounted tokens, lower time-to-first-token). Only the post text and
+# entity hints vary per request and those stay in the user message.
+_SYSTEM_PROMPT = """You are an expert at extracting job posting information from social media posts. Extract structured information accurately and return it as valid JSON.
+
+Extract job posting information from the LinkedIn post you are given. Return a JSON object with the following fields:
+
+- job_title: The specific job title being offered
+- company: The company name
+- location: Where the job is located (city, state, remote, etc.)
+- skills: Array of required technical skills and qualifications
+- experience_required: Experience level or years required
+- hr_name: Name of the HR contact person (if mentioned)
+- hr_email: Email address of the HR contact (if visible)
+- salary_range: Salary information if mentioned
+- job_type: Employment type (full-time, part-time, contract, internship)
+- application_deadline: Any mentioned deadline for applications
+
+Only include fields that are clearly mentioned or strongly implied. If information is not available, use null for single values or empty arrays for lists.
+
+Return only valid JSON, no additional text or explanation."""
+
+
+def _retry_wait(retry_state):
+    """Honor the server's retry-after header when present, else back off exponentially."""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    response = getattr(exc, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+    return wait_exponential_jitter(initial=1, max=30)(retry_state)
+
 
 class OpenAIService:
     """Service for using OpenAI API to extract and structure job information."""
 
     def __init__(self):
         self.client = None
+        # Client-side throttle sized to the org's rate budget; keeps bursts
+        # from turning into 429s
+        self._sem = asyncio.Semaphore(settings.OPENAI_CONCURRENCY)
         self._initialize_client()
 
     def _initialize_client(self):
@@ -24,7 +130,18 @@ class OpenAIService:
         api_key = getattr(settings, 'OPENAI_API_KEY', None)
         if api_key and api_key.strip() and api_key != 'your-openai-api-key-here':
             try:
-                self.client = openai.OpenAI(api_key=api_key)
+                # Async client so completions are truly awaitable: the sync client
+                # would block the event loop for the full API round trip.
+                # The shared module-level pool is injected so this service
+                # doesn't open its own set of TLS connections.
+                # max_retries=0: tenacity owns retries so backoff and
+                # retry-after handling live in one place
+                self.client = openai.AsyncOpenAI(
+                    api_key=api_key,
+                    timeout=settings.REQUEST_TIMEOUT,
+                    max_retries=0,
+                    http_client=_HTTP_CLIENT,
+                )
                 logger.info("OpenAI client initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize OpenAI client: {e}")
@@ -48,70 +165,161 @@ class OpenAIService:
             logger.warning("OpenAI client not available, returning spaCy data only")
             return self._fallback_extraction(spacy_data)
 
+        # Don't spend an LLM call on text that isn't a job post at all;
+        # the spaCy fallback gives a cheap low-confidence result instead.
+        if not HTMLCleaner.is_job_post(raw_text):
+            logger.debug("Text does not look like a job post, skipping OpenAI call")
+            return self._fallback_extraction(spacy_data)
+
         try:
             prompt = self._build_extraction_prompt(raw_text, spacy_data)
 
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at extracting job posting information from social media posts. Extract structured information accurately and return it as valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=settings.OPENAI_MAX_TOKENS,
-                temperature=settings.OPENAI_TEMPERATURE,
-            )
+            response = await self._call_openai([
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ])
 
             result_text = response.choices[0].message.content
             if not result_text:
                 raise ValueError("Empty response from OpenAI")
 
-            # Parse JSON response
-            try:
-                extracted_data = json.loads(result_text)
-                extracted_data['confidence_score'] = self._calculate_confidence(extracted_data)
-                return extracted_data
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse OpenAI response as JSON: {e}")
-                logger.error(f"OpenAI response: {result_text}")
-                return self._fallback_extraction(spacy_data)
+            # Both response formats guarantee syntactically valid JSON
+            # (strict schema mode additionally pins the field set), so there
+            # is no repair path; anything that raises here (network, refusal)
+            # falls through to the spaCy fallback below.
+            extracted_data = orjson.loads(result_text)
+            extracted_data['confidence_score'] = self._calculate_confidence(extracted_data)
+            return extracted_data
 
         except Exception as e:
             logger.error(f"OpenAI extraction failed: {e}")
             return self._fallback_extraction(spacy_data)
 
-    def _build_extraction_prompt(self, raw_text: str, spacy_data: Dict[str, Any]) -> str:
-        """Build the prompt for OpenAI."""
+    async def submit_batch(self, items: list) -> Optional[str]:
+        """Submit a bulk extraction job through the OpenAI Batch API.
 
-        return f"""
-Extract job posting information from this LinkedIn post. Return a JSON object with the following fields:
+        Meant for offline pipelines (bulk imports, re-extraction) where
+        results within 24h are acceptable: batch pricing is half of the
+        synchronous endpoint and the calls can't be rate limited away.
+        Offline jobs call this (and poll_batch/fetch_results) directly;
+        nothing on the request path routes through it, since the HTTP
+        batch endpoint answers synchronously.
 
-- job_title: The specific job title being offered
-- company: The company name
-- location: Where the job is located (city, state, remote, etc.)
-- skills: Array of required technical skills and qualifications
-- experience_required: Experience level or years required
-- hr_name: Name of the HR contact person (if mentioned)
-- hr_email: Email address of the HR contact (if visible)
-- salary_range: Salary information if mentioned
-- job_type: Employment type (full-time, part-time, contract, internship)
-- application_deadline: Any mentioned deadline for applications
+        Args:
+            items: List of (raw_text, spacy_data) tuples
 
-Only include fields that are clearly mentioned or strongly implied. If information is not available, use null for single values or empty arrays for lists.
+        Returns:
+            The batch id, or None when the client is unavailable
+        """
+        if not self.client:
+            logger.warning("OpenAI client not available, cannot submit batch")
+            return None
 
-LinkedIn Post Text:
-{raw_text}
+        lines = []
+        for i, (raw_text, spacy_data) in enumerate(items):
+            prompt = self._build_extraction_prompt(raw_text, spacy_data)
+            lines.append(orjson.dumps({
+                "custom_id": f"item-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": settings.OPENAI_MODEL,
+                    "messages": [
+                        {"role": "system", "content": _SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt},
+                    ],
+                    "max_tokens": settings.OPENAI_MAX_TOKENS,
+                    "temperature": settings.OPENAI_TEMPERATURE,
+                    "response_format": _RESPONSE_FORMAT,
+                },
+            }).decode())
+
+        batch_file = await self.client.files.create(
+            file=("batch_input.jsonl", "\n".join(lines).encode()),
+            purpose="batch",
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted OpenAI batch {batch.id} with {len(items)} items")
+        return batch.id
+
+    async def poll_batch(self, batch_id: str):
+        """Retrieve the current status of a submitted batch."""
+        if not self.client:
+            raise RuntimeError("OpenAI client not available")
+        return await self.client.batches.retrieve(batch_id)
 
-Pre-extracted Entities (for reference):
-{json.dumps(spacy_data, indent=2)}
+    async def fetch_results(self, output_file_id: str) -> Dict[str, Dict[str, Any]]:
+        """Download a completed batch's output file and parse each line.
 
-Return only valid JSON, no additional text or explanation.
-"""
+        Returns:
+            Mapping of custom_id to extracted data (or an error dict for
+            items whose response couldn't be parsed)
+        """
+        if not self.client:
+            raise RuntimeError("OpenAI client not available")
+
+        content = await self.client.files.content(output_file_id)
+        results: Dict[str, Dict[str, Any]] = {}
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            custom_id = record.get("custom_id")
+            try:
+                body = record["response"]["body"]
+                result_text = body["choices"][0]["message"]["content"]
+                extracted = orjson.loads(result_text)
+                extracted['confidence_score'] = self._calculate_confidence(extracted)
+                results[custom_id] = extracted
+            except (KeyError, IndexError, TypeError, orjson.JSONDecodeError) as e:
+                logger.error(f"Failed to parse batch result for {custom_id}: {e}")
+                results[custom_id] = {"error": str(e)}
+        return results
+
+    @retry(
+        wait=_retry_wait,
+        stop=stop_after_attempt(5),
+        retry=retry_if_exception_type((openai.RateLimitError, openai.APITimeoutError)),
+        reraise=True,
+    )
+    async def _call_openai(self, messages: list):
+        """Issue one chat completion under the concurrency cap, retrying rate
+        limits and timeouts with backoff."""
+        async with self._sem:
+            return await self.client.chat.completions.create(
+                model=settings.OPENAI_MODEL,
+                messages=messages,
+                max_tokens=settings.OPENAI_MAX_TOKENS,
+                temperature=settings.OPENAI_TEMPERATURE,
+                response_format=_RESPONSE_FORMAT,
+            )
+
+    @staticmethod
+    def _build_entity_hints(spacy_data: Dict[str, Any]) -> str:
+        """Condense spaCy output into a one-line hint for the prompt.
+
+        The full entity dump ran to hundreds of tokens per request, most of
+        which the model ignored; only the top organization/location
+        candidates and any emails actually move the needle.
+        """
+        entities = spacy_data.get('spacy_entities', {})
+        orgs = [e['text'] for e in entities.get('organizations', [])[:3]]
+        locs = [e['text'] for e in entities.get('locations', [])[:3]]
+        emails = spacy_data.get('patterns', {}).get('emails', [])[:3]
+        return f"Hints: company_candidates={orgs}, location_candidates={locs}, emails={emails}"
+
+    def _build_extraction_prompt(self, raw_text: str, spacy_data: Dict[str, Any]) -> str:
+        """Build the per-request (dynamic) part of the prompt.
+
+        The instruction block lives in _SYSTEM_PROMPT; keeping it out of
+        this message is what lets the cached system prefix match across
+        requests.
+        """
+        return f"Post:\n{raw_text}\n\n{self._build_entity_hints(spacy_data)}"
 
     def _calculate_confidence(self, extracted_data: Dict[str, Any]) -> float:
         """Calculate confidence score based on extracted data completeness."""
@@ -177,6 +385,8 @@ Return only valid JSON, no additional text or explanation.
     async def cleanup(self):
         """Cleanup resources."""
         if self.client:
-            # OpenAI client cleanup if needed
-            pass
+            await self.client.close()
+            self.client = None
+        if not _HTTP_CLIENT.is_closed:
+            await _HTTP_CLIENT.aclose()
 
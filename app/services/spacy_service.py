@@ -2,7 +2,10 @@
 spaCy-based Named Entity Recognition service for job information extraction.
 """
 
+import asyncio
+import hashlib
 import spacy
+from collections import OrderedDict
 from spacy.lang.en import English
 from typing import Dict, List, Optional, Tuple
 import re
@@ -10,6 +13,30 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of cached entity-extraction results kept in memory
+CACHE_MAX_SIZE = 10_000
+
+# All pattern groups fused into one alternation so _extract_patterns walks
+# the text once instead of once per pattern (multi-pattern DFA style; group
+# names double as the result bucket keys). Longer/more specific groups come
+# first so e.g. a job title isn't shredded into a bare experience level.
+_COMBINED_PATTERNS_RE = re.compile(
+    r'(?P<emails>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)'
+    r'|(?P<salary_patterns>'
+    r'\$[\d,]+(?:\.\d{2})?(?:\s*(?:-|to|–)\s*\$[\d,]+(?:\.\d{2})?)?(?:\s*(?:per|\/)\s*(?:year|month|hour|hr))?'
+    r'|[\d,]+(?:\.\d{2})?\s*(?:-|to|–)\s*[\d,]+(?:\.\d{2})?\s*(?:per|\/)\s*(?:year|month|hour|hr))'
+    r'|(?P<phone_numbers>\b\d{3}[-.]?\d{3}[-.]?\d{4}\b)'
+    r'|(?P<job_titles>\b(?:(?:senior|junior|lead|principal|staff)\s+)?'
+    r'(?:software|frontend|backend|full.?stack|devops|product|data|machine learning|ai|ux|ui)\s+'
+    r'(?:engineer|developer|manager|scientist|designer)\b)'
+    r'|(?P<experience_patterns>'
+    r'\d+\+?\s*years?\s*(?:of\s*)?experience|entry[- ]level|junior|mid|senior|lead|principal|experienced?\s+in)',
+    re.IGNORECASE,
+)
+
+# Buckets whose match lists are deduplicated, matching the old behaviour
+_DEDUPED_BUCKETS = ('experience_patterns', 'job_titles', 'salary_patterns')
+
 
 class SpacyService:
     """Service for extracting entities from job post text using spaCy."""
@@ -17,14 +44,35 @@ class SpacyService:
     def __init__(self):
         self.nlp: Optional[spacy.language.Language] = None
         self.sentencizer = None
+        self._load_lock = asyncio.Lock()
+        # Extraction is a pure function of the text, so re-submitted posts
+        # (retries, re-crawls) hit this LRU instead of the pipeline. Same
+        # OrderedDict-plus-lock shape as the Gemini response cache.
+        self._cache: "OrderedDict[str, Dict[str, any]]" = OrderedDict()
+        self._cache_lock = asyncio.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    # Only the NER component feeds doc.ents; the rest of the pipeline is
+    # dead weight for this service (RSS and per-doc latency).
+    EXCLUDED_COMPONENTS = ["parser", "tagger", "lemmatizer", "attribute_ruler"]
 
     async def initialize(self):
-        """Initialize spaCy model."""
+        """Initialize the service.
+
+        The model itself loads lazily on first use (see _ensure_nlp), so
+        startup costs nothing and requests that never touch entities pay
+        no model RAM.
+        """
+        logger.info("spaCy service initialized (model loads on first use)")
+
+    def _load_model(self):
+        """Load the spaCy model synchronously (runs in a thread executor)."""
         try:
-            # Load spaCy model
-            self.nlp = spacy.load("en_core_web_sm")
+            # Load spaCy model without the components we never consume
+            self.nlp = spacy.load("en_core_web_sm", exclude=self.EXCLUDED_COMPONENTS)
 
-            # Add sentencizer for better sentence segmentation
+            # Sentencizer replaces the excluded parser for sentence segmentation
             self.sentencizer = self.nlp.add_pipe("sentencizer")
 
             logger.info("spaCy model loaded successfully")
@@ -33,10 +81,19 @@ class SpacyService:
             # Download model if not available
             import subprocess
             subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
+            self.nlp = spacy.load("en_core_web_sm", exclude=self.EXCLUDED_COMPONENTS)
             self.sentencizer = self.nlp.add_pipe("sentencizer")
             logger.info("spaCy model downloaded and loaded")
 
+    async def _ensure_nlp(self):
+        """Load the model on first use, double-checked under a lock so
+        concurrent callers don't each trigger a load."""
+        if self.nlp is not None:
+            return
+        async with self._load_lock:
+            if self.nlp is None:
+                await asyncio.get_running_loop().run_in_executor(None, self._load_model)
+
     async def extract_entities(self, text: str) -> Dict[str, any]:
         """
         Extract named entities from text using spaCy.
@@ -47,30 +104,29 @@ class SpacyService:
         Returns:
             Dictionary with extracted entities
         """
-        if not self.nlp:
-            raise RuntimeError("spaCy model not initialized")
+        cache_key = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        async with self._cache_lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                self._cache_hits += 1
+                logger.debug(f"Entity cache hit ({self._cache_hits} hits / {self._cache_misses} misses)")
+                return self._cache[cache_key]
+            self._cache_misses += 1
+
+        await self._ensure_nlp()
 
         try:
-            # Process text
-            doc = self.nlp(text)
-
-            # Extract different entity types
-            entities = {
-                'persons': self._extract_entities_by_label(doc, 'PERSON'),
-                'organizations': self._extract_entities_by_label(doc, 'ORG'),
-                'locations': self._extract_entities_by_label(doc, 'GPE', 'LOC'),
-                'money': self._extract_entities_by_label(doc, 'MONEY'),
-                'dates': self._extract_entities_by_label(doc, 'DATE'),
-            }
+            # The pipeline is CPU-bound; run it in the executor so concurrent
+            # OpenAI/Gemini awaits keep progressing.
+            doc = await asyncio.get_running_loop().run_in_executor(None, self.nlp, text)
+            result = self._build_result(doc, text)
 
-            # Extract additional patterns
-            patterns = self._extract_patterns(text)
+            async with self._cache_lock:
+                self._cache[cache_key] = result
+                if len(self._cache) > CACHE_MAX_SIZE:
+                    self._cache.popitem(last=False)
 
-            return {
-                'spacy_entities': entities,
-                'patterns': patterns,
-                'confidence': self._calculate_confidence(doc, entities),
-            }
+            return result
 
         except Exception as e:
             logger.error(f"Error extracting entities: {e}")
@@ -86,6 +142,45 @@ class SpacyService:
                 'confidence': 0.0,
             }
 
+    async def extract_entities_batch(self, texts: List[str]) -> List[Dict[str, any]]:
+        """
+        Extract entities from many texts at once via nlp.pipe.
+
+        Batching amortizes per-doc pipeline overhead; the pipe runs in a
+        thread executor so the event loop stays free.
+
+        Args:
+            texts: Input texts to analyze
+
+        Returns:
+            One result dict per input text, in order
+        """
+        await self._ensure_nlp()
+
+        loop = asyncio.get_running_loop()
+        docs = await loop.run_in_executor(
+            None, lambda: list(self.nlp.pipe(texts, batch_size=64))
+        )
+        return [self._build_result(doc, text) for doc, text in zip(docs, texts)]
+
+    def _build_result(self, doc: spacy.tokens.Doc, text: str) -> Dict[str, any]:
+        """Assemble the extraction result for a processed doc."""
+        entities = {
+            'persons': self._extract_entities_by_label(doc, 'PERSON'),
+            'organizations': self._extract_entities_by_label(doc, 'ORG'),
+            'locations': self._extract_entities_by_label(doc, 'GPE', 'LOC'),
+            'money': self._extract_entities_by_label(doc, 'MONEY'),
+            'dates': self._extract_entities_by_label(doc, 'DATE'),
+        }
+
+        patterns = self._extract_patterns(text)
+
+        return {
+            'spacy_entities': entities,
+            'patterns': patterns,
+            'confidence': self._calculate_confidence(doc, entities),
+        }
+
     def _extract_entities_by_label(self, doc: spacy.tokens.Doc, *labels: str) -> List[Dict[str, any]]:
         """Extract entities by label."""
         entities = []
@@ -103,70 +198,28 @@ class SpacyService:
         return entities
 
     def _extract_patterns(self, text: str) -> Dict[str, List[str]]:
-        """Extract additional patterns not covered by spaCy NER."""
-
-        patterns = {
-            'emails': self._extract_emails(text),
-            'phone_numbers': self._extract_phone_numbers(text),
-            'experience_patterns': self._extract_experience_patterns(text),
-            'job_titles': self._extract_job_title_patterns(text),
-            'salary_patterns': self._extract_salary_patterns(text),
+        """Extract additional patterns not covered by spaCy NER.
+
+        A single pass over the text with the fused alternation fills every
+        bucket at once, instead of scanning the text per pattern group.
+        """
+        patterns: Dict[str, List[str]] = {
+            'emails': [],
+            'phone_numbers': [],
+            'experience_patterns': [],
+            'job_titles': [],
+            'salary_patterns': [],
         }
 
-        return patterns
+        for match in _COMBINED_PATTERNS_RE.finditer(text):
+            patterns[match.lastgroup].append(match.group())
+
+        # dict.fromkeys keeps first-seen order (set() shuffled it) and the
+        # case-fold collapses "Senior"/"senior" into one entry
+        for bucket in _DEDUPED_BUCKETS:
+            patterns[bucket] = list(dict.fromkeys(m.lower().strip() for m in patterns[bucket] if m))
 
-    def _extract_emails(self, text: str) -> List[str]:
-        """Extract email addresses."""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        return re.findall(email_pattern, text, re.IGNORECASE)
-
-    def _extract_phone_numbers(self, text: str) -> List[str]:
-        """Extract phone numbers."""
-        # Basic phone pattern - can be enhanced
-        phone_pattern = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-        return re.findall(phone_pattern, text)
-
-    def _extract_experience_patterns(self, text: str) -> List[str]:
-        """Extract experience requirements."""
-        experience_patterns = [
-            r'(\d+\+?\s*years?\s*(?:of\s*)?experience)',
-            r'(entry[- ]level)',
-            r'(junior|mid|senior|lead|principal)',
-            r'(experienced?\s+in)',
-        ]
-
-        matches = []
-        for pattern in experience_patterns:
-            matches.extend(re.findall(pattern, text, re.IGNORECASE))
-
-        return list(set(matches))  # Remove duplicates
-
-    def _extract_job_title_patterns(self, text: str) -> List[str]:
-        """Extract potential job titles."""
-        # Common job title patterns
-        title_patterns = [
-            r'\b(?:senior|junior|lead|principal|staff)\s+(?:software|frontend|backend|full.?stack|devops|product|data|machine learning|ai|ux|ui)\s+(?:engineer|developer|manager|scientist|designer)\b',
-            r'\b(?:software|frontend|backend|full.?stack|devops|product|data|machine learning|ai|ux|ui)\s+(?:engineer|developer|manager|scientist|designer)\b',
-        ]
-
-        matches = []
-        for pattern in title_patterns:
-            matches.extend(re.findall(pattern, text, re.IGNORECASE))
-
-        return list(set(matches))
-
-    def _extract_salary_patterns(self, text: str) -> List[str]:
-        """Extract salary information."""
-        salary_patterns = [
-            r'\$[\d,]+(?:\.\d{2})?(?:\s*(?:-|to|–)\s*\$[\d,]+(?:\.\d{2})?)?(?:\s*(?:per|\/)\s*(?:year|month|hour|hr))?',
-            r'[\d,]+(?:\.\d{2})?\s*(?:-|to|–)\s*[\d,]+(?:\.\d{2})?\s*(?:per|\/)\s*(?:year|month|hour|hr)',
-        ]
-
-        matches = []
-        for pattern in salary_patterns:
-            matches.extend(re.findall(pattern, text, re.IGNORECASE))
-
-        return list(set(matches))
+        return patterns
 
     def _calculate_confidence(self, doc: spacy.tokens.Doc, entities: Dict) -> float:
         """Calculate overall confidence in entity extraction."""
@@ -9,6 +9,24 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Prefer the C-backed lxml parser; fall back to the stdlib parser when the
+# optional dependency isn't installed.
+try:
+    import lxml  # noqa: F401
+    _BS_PARSER = 'lxml'
+except ImportError:
+    _BS_PARSER = 'html.parser'
+
+# selectolax builds its DOM in C with no Python object per tag, roughly an
+# order of magnitude faster than BeautifulSoup. Optional: BS4 stays as the
+# fallback engine, and USE_SELECTOLAX can force it off.
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+except ImportError:
+    _SelectolaxParser = None
+
+from app.core.config import settings
+
 
 class HTMLCleaner:
     """Clean and extract readable text from LinkedIn post HTML."""
@@ -47,100 +65,156 @@ class HTMLCleaner:
         'form',
     ]
 
-    # Text patterns to clean
-    CLEANUP_PATTERNS = [
-        (r'\n+', '\n'),  # Multiple newlines to single
-        (r'\s+', ' '),   # Multiple spaces to single
-        (r'^\s+', ''),   # Leading whitespace
-        (r'\s+$', ''),   # Trailing whitespace
-        (r'•', '-'),     # Bullet points
-        (r'…', '...'),   # Ellipsis
+    # Union of all noise selectors so removal is one tree walk, not one
+    # per selector
+    NOISE_SELECTOR = ', '.join(LINKEDIN_NOISE_SELECTORS)
+
+    # Single-character substitutions applied in one C-level translate pass
+    CHAR_TRANSLATIONS = str.maketrans({
+        '•': '-',    # Bullet points
+        '…': '...',  # Ellipsis
+    })
+
+    # Any whitespace run collapses to a single space (the old pattern chain
+    # reduced newlines first, then folded all remaining whitespace to spaces)
+    WHITESPACE_RE = re.compile(r'\s+')
+
+    # Word counting walks the string with finditer instead of str.split,
+    # which would allocate a list of every word just to take its length
+    WORD_RE = re.compile(r'\S+')
+
+    # Phrases that mark a post as a job posting
+    JOB_KEYWORDS = [
+        'hiring', 'hiring now', 'we\'re hiring', 'we are hiring',
+        'looking for', 'seeking', 'recruiting', 'join our team',
+        'open position', 'career opportunity', 'job opening',
+        'vacancy', 'positions available', 'talent acquisition',
+        'growing team', 'expand'
     ]
 
+    # All keywords fused into one case-insensitive alternation so the check
+    # is a single scan of the text instead of one substring search per
+    # keyword (same multi-pattern approach as the entity regex in
+    # spacy_service), and the text.lower() copy is never allocated
+    JOB_KEYWORDS_RE = re.compile(
+        '|'.join(re.escape(keyword) for keyword in JOB_KEYWORDS),
+        re.IGNORECASE,
+    )
+
     @staticmethod
-    def clean_html(raw_html: str) -> str:
+    def clean_and_extract(raw_html: str) -> tuple:
         """
-        Clean HTML content and extract readable text.
+        Clean HTML content and extract metadata in a single parse.
+
+        Callers that need both the readable text and the post metadata
+        previously parsed the HTML twice; parsing dominates the runtime,
+        so the tree is built once and both outputs derive from it.
 
         Args:
             raw_html: Raw HTML from LinkedIn post
 
         Returns:
-            Clean, readable text
+            Tuple of (clean text, metadata dict)
         """
+        metadata = {
+            'has_images': False,
+            'has_links': False,
+            'has_video': False,
+            'word_count': 0,
+            'character_count': 0,
+        }
+
         if not raw_html or not raw_html.strip():
-            return ""
+            return "", metadata
 
         try:
-            # Parse HTML
-            soup = BeautifulSoup(raw_html, 'html.parser')
-
-            # Remove noise elements
-            for selector in HTMLCleaner.LINKEDIN_NOISE_SELECTORS:
-                try:
-                    elements = soup.select(selector)
-                    for element in elements:
-                        element.decompose()
-                except Exception as e:
-                    logger.warning(f"Failed to remove selector {selector}: {e}")
+            if _SelectolaxParser is not None and settings.USE_SELECTOLAX:
+                text = HTMLCleaner._extract_text_selectolax(raw_html, metadata)
+            else:
+                text = HTMLCleaner._extract_text_bs4(raw_html, metadata)
 
-            # Extract text content
-            text = soup.get_text(separator='\n', strip=True)
+            # Normalize in two passes total: one translate for the character
+            # substitutions, one regex for whitespace collapse + strip
+            text = HTMLCleaner.WHITESPACE_RE.sub(' ', text.translate(HTMLCleaner.CHAR_TRANSLATIONS)).strip()
 
-            # Apply cleanup patterns
-            for pattern, replacement in HTMLCleaner.CLEANUP_PATTERNS:
-                text = re.sub(pattern, replacement, text)
-
-            # Final cleanup
-            text = text.strip()
+            # Text statistics come from the already-built string; no second
+            # tree walk needed
+            metadata['word_count'] = sum(1 for _ in HTMLCleaner.WORD_RE.finditer(text))
+            metadata['character_count'] = len(text)
 
             # Validate result
             if not text or len(text) < 10:
                 logger.warning("Extracted text too short or empty")
-                return raw_html  # Fallback to original if cleaning fails
+                return raw_html, metadata  # Fallback to original if cleaning fails
 
-            return text
+            return text, metadata
 
         except Exception as e:
             logger.error(f"Failed to clean HTML: {e}")
-            return raw_html  # Fallback to original
+            return raw_html, metadata  # Fallback to original
 
     @staticmethod
-    def extract_post_metadata(raw_html: str) -> dict:
+    def _extract_text_selectolax(raw_html: str, metadata: dict) -> str:
+        """Parse with selectolax, fill media metadata, and return raw text."""
+        tree = _SelectolaxParser(raw_html)
+
+        metadata['has_images'] = tree.css_first('img, picture') is not None
+        metadata['has_video'] = tree.css_first('video, iframe') is not None
+        metadata['has_links'] = tree.css_first('a[href]') is not None
+
+        # Remove noise elements in a single selector pass
+        try:
+            for node in tree.css(HTMLCleaner.NOISE_SELECTOR):
+                node.decompose()
+        except Exception as e:
+            logger.warning(f"Failed to remove noise selectors: {e}")
+
+        return tree.text(separator='\n', strip=True)
+
+    @staticmethod
+    def _extract_text_bs4(raw_html: str, metadata: dict) -> str:
+        """Parse with BeautifulSoup, fill media metadata, and return raw text."""
+        soup = BeautifulSoup(raw_html, _BS_PARSER)
+
+        # Check for media content (find stops on the first hit)
+        metadata['has_images'] = soup.find(['img', 'picture']) is not None
+        metadata['has_video'] = soup.find(['video', 'iframe']) is not None
+        metadata['has_links'] = soup.find('a', href=True) is not None
+
+        # Remove noise elements in a single selector pass
+        try:
+            for element in soup.select(HTMLCleaner.NOISE_SELECTOR):
+                element.decompose()
+        except Exception as e:
+            logger.warning(f"Failed to remove noise selectors: {e}")
+
+        return soup.get_text(separator='\n', strip=True)
+
+    @staticmethod
+    def clean_html(raw_html: str) -> str:
         """
-        Extract additional metadata from LinkedIn post HTML.
+        Clean HTML content and extract readable text.
 
         Args:
             raw_html: Raw HTML from LinkedIn post
 
         Returns:
-            Dictionary with extracted metadata
+            Clean, readable text
         """
-        metadata = {
-            'has_images': False,
-            'has_links': False,
-            'has_video': False,
-            'word_count': 0,
-            'character_count': 0,
-        }
-
-        try:
-            soup = BeautifulSoup(raw_html, 'html.parser')
-
-            # Check for media content
-            metadata['has_images'] = bool(soup.find_all(['img', 'picture']))
-            metadata['has_video'] = bool(soup.find_all(['video', 'iframe']))
-            metadata['has_links'] = bool(soup.find_all('a', href=True))
+        return HTMLCleaner.clean_and_extract(raw_html)[0]
 
-            # Get text statistics
-            text = soup.get_text()
-            metadata['word_count'] = len(text.split()) if text else 0
-            metadata['character_count'] = len(text) if text else 0
+    @staticmethod
+    def extract_post_metadata(raw_html: str) -> dict:
+        """
+        Extract additional metadata from LinkedIn post HTML.
 
-        except Exception as e:
-            logger.error(f"Failed to extract metadata: {e}")
+        Args:
+            raw_html: Raw HTML from LinkedIn post
 
-        return metadata
+        Returns:
+            Dictionary with extracted metadata
+        """
+        return HTMLCleaner.clean_and_extract(raw_html)[1]
 
     @staticmethod
     def is_job_post(text: str) -> bool:
@@ -153,15 +227,6 @@ class HTMLCleaner:
         Returns:
             True if likely a job post
         """
-        job_keywords = [
-            'hiring', 'hiring now', 'we\'re hiring', 'we are hiring',
-            'looking for', 'seeking', 'recruiting', 'join our team',
-            'open position', 'career opportunity', 'job opening',
-            'vacancy', 'positions available', 'talent acquisition',
-            'growing team', 'expand'
-        ]
-
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in job_keywords)
+        return HTMLCleaner.JOB_KEYWORDS_RE.search(text) is not None
 
 
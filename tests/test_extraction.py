@@ -64,3 +64,69 @@ def test_email_extraction():
     assert "jane@startup.io" in emails
 
 
+def test_pattern_extraction():
+    """Test the combined pattern pass and its dedupe behavior."""
+    from app.services.spacy_service import SpacyService
+
+    service = SpacyService()
+    text = (
+        "Senior Software Engineer wanted. We need a senior software engineer "
+        "with 5+ years experience. Salary $100,000 - $120,000 per year. "
+        "Contact recruiter@acme.com or call 555-123-4567."
+    )
+    patterns = service._extract_patterns(text)
+
+    assert patterns['emails'] == ['recruiter@acme.com']
+    assert patterns['phone_numbers'] == ['555-123-4567']
+    # Deduped buckets are lowercased and order-preserving, so the two
+    # casings of the title collapse into one entry
+    assert patterns['job_titles'] == ['senior software engineer']
+    assert '5+ years experience' in patterns['experience_patterns']
+    assert len(patterns['salary_patterns']) == 1
+
+
+def test_clean_and_extract_metadata():
+    """Test that text and metadata come from the same single parse."""
+    from app.utils.html_cleaner import HTMLCleaner
+
+    html = (
+        '<div><p>We are hiring a backend developer!</p>'
+        '<img src="logo.png"><a href="https://example.com">details</a>'
+        '<script>track()</script></div>'
+    )
+    text, metadata = HTMLCleaner.clean_and_extract(html)
+
+    assert 'hiring a backend developer' in text
+    assert 'track()' not in text
+    assert metadata['has_images'] is True
+    assert metadata['has_links'] is True
+    assert metadata['has_video'] is False
+    assert metadata['word_count'] == len(text.split())
+    assert metadata['character_count'] == len(text)
+
+
+def test_is_job_post():
+    """Test the job post keyword gate."""
+    from app.utils.html_cleaner import HTMLCleaner
+
+    assert HTMLCleaner.is_job_post("We're Hiring a data engineer!")
+    assert HTMLCleaner.is_job_post("Exciting CAREER OPPORTUNITY in Berlin")
+    assert not HTMLCleaner.is_job_post("Had a great weekend hiking with friends.")
+
+
+def test_request_size_limit():
+    """Test that oversized bodies are rejected before parsing."""
+    from fastapi.testclient import TestClient
+    from app.core.config import settings
+    from app.main import app
+
+    client = TestClient(app)
+
+    # Small requests pass through the middleware untouched
+    assert client.get("/").status_code == 200
+
+    oversized = b"x" * (settings.MAX_REQUEST_BYTES + 1)
+    response = client.post("/api/v1/extract", content=oversized)
+    assert response.status_code == 413
+
+